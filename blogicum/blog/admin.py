@@ -1,40 +1,42 @@
-from django.contrib import admin
-from .models import Category, Post, Location, Comment
-
-admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Post)
-admin.site.register(Comment)
-
-
-class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('title', 'is_published')
-    list_editable = ('is_published',)
-
-
-class LocationAdmin(admin.ModelAdmin):
-    list_display = ('name', 'is_published')
-    list_editable = ('is_published',)
-
-
-class CommentAdmin(admin.ModelAdmin):
-    list_display = ('author', 'post', 'text', 'created_at')
-    list_filter = ('created_at',)
-
-
-class PostAdmin(admin.ModelAdmin):
-    list_display = (
-        'title',
-        'pub_date',
-        'author',
-        'is_published',
-        'location',
-        'category',
-        'created_at'
-    )
-    list_editable = ('is_published',)
-    search_fields = ('title', 'text')
-    list_filter = ('category', 'location')
-    list_display_links = ('title',)
-    empty_value_display = 'Не задано'
-    readonly_fields = ('created_at',)
+from django.contrib import admin
+from .models import Category, Post, Location, Comment
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('title', 'is_published')
+    list_editable = ('is_published',)
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'is_published')
+    list_editable = ('is_published',)
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('author', 'post', 'text', 'created_at')
+    list_filter = ('created_at',)
+    list_select_related = ('author', 'post')
+
+
+@admin.register(Post)
+class PostAdmin(admin.ModelAdmin):
+    list_display = (
+        'title',
+        'pub_date',
+        'author',
+        'is_published',
+        'location',
+        'category',
+        'created_at'
+    )
+    list_editable = ('is_published',)
+    search_fields = ('title', 'text')
+    list_filter = ('category', 'location')
+    list_display_links = ('title',)
+    list_select_related = ('author', 'category', 'location')
+    raw_id_fields = ('author', 'category', 'location')
+    empty_value_display = 'Не задано'
+    readonly_fields = ('created_at',)
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-08-26 10:32
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_auto_20260826_1325'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='post',
+            name='unique_title_author',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-08-26 10:32
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_remove_post_unique_title_author'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'default_related_name': 'comments', 'ordering': ('id',), 'verbose_name': 'комментарий', 'verbose_name_plural': 'Комментарии'},
+        ),
+    ]
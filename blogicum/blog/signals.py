@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Category, Comment, Location, Post
+
+INDEX_CACHE_VERSION_KEY = 'blog:index:version'
+CATEGORY_CACHE_KEY = 'blog:cat:{slug}'
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_index_cache(sender, **kwargs):
+    """Сбрасывает кеш главной страницы при изменении её данных.
+
+    Страницы кешируются по ключам с номером версии; инкремент версии
+    разом делает недостижимыми ключи всех закешированных страниц.
+    """
+    try:
+        cache.incr(INDEX_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.add(INDEX_CACHE_VERSION_KEY, 1, None)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cache(sender, instance, **kwargs):
+    """Сбрасывает кеш категории при её изменении или удалении"""
+    cache.delete(CATEGORY_CACHE_KEY.format(slug=instance.slug))
@@ -0,0 +1,289 @@
+import inspect
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, override_settings
+)
+from django.urls import reverse
+from django.utils import timezone
+
+from . import views
+from .models import Category, Comment, Post
+
+User = get_user_model()
+
+
+class ViewQueryCountTests(TestCase):
+    """Регрессионные тесты количества запросов на страницах блога.
+
+    Фиксируют, что списки и детальная страница не делают запросов
+    на каждый пост или комментарий (N+1): количество запросов не
+    должно зависеть от размера страницы.
+    """
+
+    INDEX_QUERIES = 2
+    INDEX_CACHED_QUERIES = 0
+    CATEGORY_QUERIES = 3
+    PROFILE_QUERIES = 3
+    DETAIL_QUERIES = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author', password='pass')
+        cls.categories = [
+            Category.objects.create(
+                title=f'Категория {i}',
+                description='Описание',
+                slug=f'category-{i}'
+            )
+            for i in range(3)
+        ]
+        now = timezone.now()
+        cls.posts = []
+        for i in range(25):
+            post = Post.objects.create(
+                title=f'Пост {i}',
+                text='Текст поста',
+                # Сдвиг минимум на час: CURRENT_TIMESTAMP в SQLite имеет
+                # точность до секунды, пост "прямо сейчас" пограничен.
+                pub_date=now - timedelta(hours=i + 1),
+                author=cls.author,
+                category=cls.categories[i % len(cls.categories)]
+            )
+            for j in range(5):
+                Comment.objects.create(
+                    post=post,
+                    author=cls.author,
+                    text=f'Комментарий {i}-{j}'
+                )
+            cls.posts.append(post)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_index_query_count(self):
+        with self.assertNumQueries(self.INDEX_QUERIES):
+            response = self.client.get(reverse('blog:index'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_index_served_from_cache(self):
+        self.client.get(reverse('blog:index'))
+        with self.assertNumQueries(self.INDEX_CACHED_QUERIES):
+            response = self.client.get(reverse('blog:index'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_index_pages_cached_independently(self):
+        self.client.get(reverse('blog:index'))
+        response = self.client.get(reverse('blog:index'), {'page': '2'})
+        self.assertContains(response, self.posts[10].title)
+
+    def test_index_cache_invalidated_on_new_post(self):
+        self.client.get(reverse('blog:index'))
+        post = Post.objects.create(
+            title='Свежий пост',
+            text='Текст поста',
+            pub_date=timezone.now() - timedelta(hours=1),
+            author=self.author,
+            category=self.categories[0]
+        )
+        response = self.client.get(reverse('blog:index'))
+        self.assertContains(response, post.title)
+
+    def test_category_posts_query_count(self):
+        url = reverse(
+            'blog:category_posts',
+            kwargs={'category_slug': self.categories[0].slug}
+        )
+        with self.assertNumQueries(self.CATEGORY_QUERIES):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_query_count(self):
+        url = reverse(
+            'blog:profile',
+            kwargs={'username': self.author.username}
+        )
+        with self.assertNumQueries(self.PROFILE_QUERIES):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_detail_query_count(self):
+        url = reverse(
+            'blog:post_detail',
+            kwargs={'post_id': self.posts[0].id}
+        )
+        with self.assertNumQueries(self.DETAIL_QUERIES):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_as_cards_returns_dicts_in_one_query(self):
+        with self.assertNumQueries(1):
+            cards = list(Post.objects.published().as_cards())
+        self.assertEqual(len(cards), len(self.posts))
+        card = cards[0]
+        self.assertEqual(
+            set(card),
+            {
+                'id', 'title', 'pub_date',
+                'author__username', 'category__slug', 'comment_count',
+            }
+        )
+        self.assertEqual(card['comment_count'], 5)
+
+
+class KeysetPaginationTests(TestCase):
+    """Тесты keyset-пагинации списков постов"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('keyset', password='pass')
+        cls.category = Category.objects.create(
+            title='Категория',
+            description='Описание',
+            slug='keyset-category'
+        )
+        now = timezone.now()
+        cls.posts = [
+            Post.objects.create(
+                title=f'Пост {i:02d}',
+                text='Текст поста',
+                pub_date=now - timedelta(hours=i + 1),
+                author=cls.author,
+                category=cls.category
+            )
+            for i in range(25)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def _request(self, params=None):
+        return RequestFactory().get('/', params or {})
+
+    def test_cursor_round_trip(self):
+        qs = Post.objects.published()
+        page1 = views.get_keyset_page(qs, self._request(), per_page=10)
+        self.assertTrue(page1.is_first)
+        self.assertEqual(len(page1), 10)
+        self.assertTrue(page1.has_next)
+
+        page2 = views.get_keyset_page(
+            qs, self._request({'cursor': page1.next_cursor}), per_page=10
+        )
+        self.assertFalse(page2.is_first)
+        self.assertEqual(len(page2), 10)
+
+        page3 = views.get_keyset_page(
+            qs, self._request({'cursor': page2.next_cursor}), per_page=10
+        )
+        self.assertEqual(len(page3), 5)
+        self.assertFalse(page3.has_next)
+        self.assertIsNone(page3.next_cursor)
+        self.assertTrue(page3.has_other_pages())
+
+        seen = [post.id for page in (page1, page2, page3) for post in page]
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), {post.id for post in self.posts})
+
+    def test_malformed_cursor_falls_back_to_first_page(self):
+        expected = [post.id for post in self.posts[:10]]
+        for bad_cursor in ('мусор', '2026-99-99,1', '1,2,3', ','):
+            page = views.get_keyset_page(
+                Post.objects.published(),
+                self._request({'cursor': bad_cursor}),
+                per_page=10
+            )
+            self.assertTrue(page.is_first)
+            self.assertEqual([post.id for post in page], expected)
+
+    def test_exact_page_boundary(self):
+        page = views.get_keyset_page(
+            Post.objects.published(), self._request(), per_page=len(self.posts)
+        )
+        self.assertEqual(len(page), len(self.posts))
+        self.assertFalse(page.has_next)
+        self.assertIsNone(page.next_cursor)
+        self.assertFalse(page.has_other_pages())
+
+    @override_settings(BLOG_KEYSET_PAGINATION=True)
+    def test_index_renders_cursor_navigation(self):
+        response = self.client.get(reverse('blog:index'))
+        self.assertContains(response, 'cursor=')
+        next_cursor = response.context['page_obj'].next_cursor
+
+        response = self.client.get(
+            reverse('blog:index'), {'cursor': next_cursor}
+        )
+        self.assertContains(response, self.posts[10].title)
+        self.assertContains(response, 'Первая')
+
+
+class AuthorCommentPaginationTests(TestCase):
+    """Автор листает полный список комментариев через ?cpage=N."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('commenter', password='pass')
+        category = Category.objects.create(
+            title='Категория',
+            description='Описание',
+            slug='category'
+        )
+        cls.post = Post.objects.create(
+            title='Пост с комментариями',
+            text='Текст поста',
+            pub_date=timezone.now() - timedelta(hours=1),
+            author=cls.author,
+            category=category
+        )
+        for i in range(views.COMMENTS_PER_PAGE + 10):
+            Comment.objects.create(
+                post=cls.post,
+                author=cls.author,
+                text=f'Комментарий {i:03d}',
+                is_published=(i % 2 == 0)
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.author)
+
+    def test_author_can_reach_second_comment_page(self):
+        url = reverse(
+            'blog:post_detail',
+            kwargs={'post_id': self.post.id}
+        )
+        first_beyond_page = f'Комментарий {views.COMMENTS_PER_PAGE:03d}'
+
+        response = self.client.get(url)
+        self.assertContains(response, 'cpage=2')
+        self.assertContains(response, 'Комментарий 000')
+        self.assertNotContains(response, first_beyond_page)
+
+        response = self.client.get(url, {'cpage': '2'})
+        self.assertContains(response, first_beyond_page)
+        self.assertContains(response, 'cpage=1')
+
+
+class PublishedApiTests(SimpleTestCase):
+    """Следит, что опубликованные посты берутся единственным способом.
+
+    Второй менеджер (Post.published) позволял собрать queryset в обход
+    оптимизированной цепочки и незаметно вернуть N+1.
+    """
+
+    def test_no_second_manager_on_post(self):
+        self.assertFalse(
+            hasattr(Post, 'published'),
+            'Используйте Post.objects.published() вместо второго менеджера.'
+        )
+
+    def test_views_use_objects_published(self):
+        self.assertNotIn(
+            'Post.published',
+            inspect.getsource(views),
+            'Во view-функциях опубликованные посты должны запрашиваться '
+            'через Post.objects.published().'
+        )
@@ -1,5 +1,9 @@
+from datetime import datetime
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
@@ -8,26 +12,78 @@ from django.http import Http404
 from django.views.decorators.csrf import requires_csrf_token
 from django.views.generic import CreateView
 from django.urls import reverse_lazy
-from django.db.models import Count
+from django.db.models import Prefetch, Q
 
 from .forms import (
     CommentForm, PostForm, CustomUserChangeForm, RegistrationForm
 )
 from .models import Category, Comment, Post
+from .signals import CATEGORY_CACHE_KEY, INDEX_CACHE_VERSION_KEY
 
 User = get_user_model()
 POSTS_PER_PAGE = 10
-
-
-def annotate_posts_with_comments(queryset):
-    """Аннотирует посты количеством комментариев с обязательной сортировкой"""
-    return queryset.annotate(
-        comment_count=Count('comments')
-    ).order_by('-pub_date')
+COMMENTS_PER_PAGE = 50
+INDEX_CACHE_TTL = 30
+INDEX_PAGE_CACHE_KEY = 'blog:index:v{version}:p{page}'
+CATEGORY_CACHE_TTL = 300
+
+
+class KeysetPage:
+    """Страница keyset-пагинации: список постов плюс курсор следующей"""
+
+    # Позволяет шаблону пагинатора отличить курсорную страницу от Page.
+    is_keyset = True
+
+    def __init__(self, object_list, next_cursor, is_first=True):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.is_first = is_first
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next or not self.is_first
+
+
+def get_keyset_page(queryset, request, per_page=POSTS_PER_PAGE):
+    """Keyset-пагинация по (pub_date, id) вместо COUNT(*) + OFFSET"""
+    is_first = True
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            pub_date_raw, post_pk = cursor.split(',')
+            pub_date = datetime.fromisoformat(pub_date_raw)
+            post_pk = int(post_pk)
+        except (TypeError, ValueError):
+            # Некорректный курсор игнорируем: отдаём первую страницу
+            pass
+        else:
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date)
+                | Q(pub_date=pub_date, id__lt=post_pk)
+            )
+            is_first = False
+    items = list(queryset.order_by('-pub_date', '-id')[:per_page + 1])
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        next_cursor = '{},{}'.format(last.pub_date.isoformat(), last.pk)
+    return KeysetPage(items, next_cursor, is_first)
 
 
 def get_page_obj(request, post_list, posts_per_page):
     """Создает объект пагинации для списка постов"""
+    if getattr(settings, 'BLOG_KEYSET_PAGINATION', False):
+        return get_keyset_page(post_list, request, posts_per_page)
     paginator = Paginator(post_list, posts_per_page)
     page_number = request.GET.get('page')
     return paginator.get_page(page_number)
@@ -39,20 +95,75 @@ def csrf_failure(request, reason=""):
     return render(request, 'pages/403.html', status=403)
 
 
+def get_index_page(request):
+    """Страница постов главной с коротким постраничным кешированием"""
+    raw_page = request.GET.get('page') or '1'
+    page_number = raw_page if raw_page.isdigit() else '1'
+    version = cache.get_or_set(INDEX_CACHE_VERSION_KEY, 1, None)
+    key = INDEX_PAGE_CACHE_KEY.format(version=version, page=page_number)
+    page_obj = cache.get(key)
+    if page_obj is None:
+        paginator = Paginator(
+            Post.objects.published().for_cards()
+            .with_comment_count().order_by('-pub_date'),
+            POSTS_PER_PAGE
+        )
+        page_obj = paginator.get_page(page_number)
+        # В кеш попадают только строки этой страницы: count/num_pages
+        # уже вычислены, неотрезанный queryset подменяем списком.
+        page_obj.object_list = list(page_obj.object_list)
+        paginator.object_list = page_obj.object_list
+        cache.set(key, page_obj, INDEX_CACHE_TTL)
+    return page_obj
+
+
 def index(request):
     """Главная страница с опубликованными постами"""
-    post_list = Post.published.select_related(
-        'category', 'author', 'location'
-    )
-    post_list = annotate_posts_with_comments(post_list)
-    page_obj = get_page_obj(request, post_list, POSTS_PER_PAGE)
+    if getattr(settings, 'BLOG_KEYSET_PAGINATION', False):
+        # Keyset-пагинации нужен queryset, кеш страниц не подходит.
+        post_list = Post.objects.published().for_cards().with_comment_count()
+        page_obj = get_page_obj(request, post_list, POSTS_PER_PAGE)
+    else:
+        page_obj = get_index_page(request)
     return render(request, 'blog/index.html', {'page_obj': page_obj})
 
 
+def _load_detail_context(request, post, form=None):
+    """Контекст detail.html с комментариями без N+1 по авторам"""
+    if request.user == post.author:
+        # Автор видит и скрытые комментарии; их может быть много,
+        # поэтому не загружаем всё сразу, а листаем постранично.
+        comments_qs = post.comments.select_related('author')
+        comments = Paginator(comments_qs, COMMENTS_PER_PAGE).get_page(
+            request.GET.get('cpage')
+        )
+    else:
+        comments = getattr(post, 'visible_comments', None)
+        if comments is None:
+            comments = post.comments.filter(
+                is_published=True
+            ).select_related('author')
+    return {
+        'post': post,
+        'comments': comments,
+        'form': form or CommentForm()
+    }
+
+
 def post_detail(request, post_id):
     """Детальная страница поста"""
     post = get_object_or_404(
-        Post.objects.select_related('category', 'location', 'author'),
+        Post.objects.select_related(
+            'category', 'location', 'author'
+        ).prefetch_related(
+            Prefetch(
+                'comments',
+                queryset=Comment.objects.filter(
+                    is_published=True
+                ).select_related('author'),
+                to_attr='visible_comments'
+            )
+        ),
         pk=post_id
     )
 
@@ -66,37 +177,29 @@ def post_detail(request, post_id):
     if not (post_is_available or user_is_author):
         raise Http404("Пост не найден")
 
-    if user_is_author:
-        comments = post.comments.all().select_related('author')
-    else:
-        comments = post.comments.filter(
-            is_published=True
-        ).select_related('author')
-
-    comments = comments.order_by('created_at')
-    form = CommentForm()
-
     return render(
         request,
         'blog/detail.html',
-        {
-            'post': post,
-            'comments': comments,
-            'form': form
-        }
+        _load_detail_context(request, post)
     )
 
 
 def category_posts(request, category_slug):
     """Страница постов категории"""
-    category = get_object_or_404(
-        Category,
-        slug=category_slug,
-        is_published=True
+    category = cache.get_or_set(
+        CATEGORY_CACHE_KEY.format(slug=category_slug),
+        lambda: Category.objects.filter(
+            slug=category_slug,
+            is_published=True
+        ).first(),
+        CATEGORY_CACHE_TTL
     )
-    post_list = Post.objects.filter(category=category).published()
-    post_list = annotate_posts_with_comments(post_list)
-    
+    if category is None:
+        raise Http404('Категория не найдена')
+    post_list = Post.objects.filter(
+        category=category
+    ).published().for_cards().with_comment_count().order_by('-pub_date')
+
     page_obj = get_page_obj(request, post_list, 10)
     return render(
         request,
@@ -105,16 +208,17 @@ def category_posts(request, category_slug):
     )
 
 
+def get_profile_posts(viewer, owner):
+    """Посты страницы профиля: владелец видит и неопубликованные"""
+    posts = owner.posts.all() if viewer == owner else owner.posts.published()
+    return posts.for_cards().with_comment_count().order_by('-pub_date')
+
+
 def profile(request, username):
     """Страница профиля пользователя"""
     user = get_object_or_404(User, username=username)
-    posts = user.posts.all()
-    
-    if request.user != user:
-        posts = posts.published()
-    
-    posts = annotate_posts_with_comments(posts)
-    page_obj = get_page_obj(request, posts, 10)
+    posts = get_profile_posts(request.user, user)
+    page_obj = get_page_obj(request, posts, POSTS_PER_PAGE)
     return render(
         request,
         'blog/profile.html',
@@ -153,8 +257,14 @@ def post_create(request):
 @login_required
 def post_edit(request, post_id):
     """Редактирование существующего поста"""
-    post = get_object_or_404(Post, pk=post_id)
-    if post.author != request.user:
+    post = get_object_or_404(
+        Post.objects.only(
+            'id', 'author_id', 'title', 'text', 'pub_date',
+            'category_id', 'location_id', 'image', 'is_published'
+        ),
+        pk=post_id
+    )
+    if post.author_id != request.user.id:
         return redirect('blog:post_detail', post_id=post_id)
 
     form = PostForm(
@@ -191,11 +301,7 @@ def add_comment(request, post_id):
     return render(
         request,
         'blog/detail.html',
-        {
-            'post': post,
-            'comments': post.comments.filter(is_published=True),
-            'form': form
-        }
+        _load_detail_context(request, post, form)
     )
 
 
@@ -203,7 +309,7 @@ def add_comment(request, post_id):
 def edit_comment(request, post_id, comment_id):
     """Редактирование комментария"""
     comment = get_object_or_404(
-        Comment,
+        Comment.objects.only('id', 'post_id', 'author_id', 'text'),
         pk=comment_id,
         post_id=post_id,
         author=request.user
@@ -224,21 +330,28 @@ def edit_comment(request, post_id, comment_id):
 @login_required
 def delete_comment(request, post_id, comment_id):
     """Удаление комментария"""
-    comment = get_object_or_404(
-        Comment,
-        pk=comment_id,
-        post_id=post_id,
-        author=request.user
-    )
-
     if request.method != 'POST':
+        comment = get_object_or_404(
+            Comment.objects.only('id', 'post_id', 'author_id', 'text'),
+            pk=comment_id,
+            post_id=post_id,
+            author=request.user
+        )
         return render(
             request,
             'blog/comment.html',
             {'comment': comment}
         )
 
-    comment.delete()
+    # Удаляем сразу queryset-ом: без выборки экземпляра, проверка
+    # автора — в самом фильтре
+    deleted, _ = Comment.objects.filter(
+        pk=comment_id,
+        post_id=post_id,
+        author=request.user
+    ).delete()
+    if not deleted:
+        raise Http404('Комментарий не найден')
     return redirect('blog:post_detail', post_id=post_id)
 
 
@@ -251,14 +364,19 @@ def profile_redirect(request):
 @login_required
 def delete_post(request, post_id):
     """Удаление поста"""
-    post = get_object_or_404(Post, pk=post_id)
-    
-    # Проверка прав доступа
-    if post.author != request.user:
-        return redirect('blog:post_detail', post_id=post_id)
-    
     # Подтверждение удаления (GET запрос)
     if request.method != 'POST':
+        # Форме подтверждения нужны поля поста, проверке прав — только
+        # author_id
+        post = get_object_or_404(
+            Post.objects.only(
+                'id', 'author_id', 'title', 'text', 'pub_date',
+                'category_id', 'location_id', 'image', 'is_published'
+            ),
+            pk=post_id
+        )
+        if post.author_id != request.user.id:
+            return redirect('blog:post_detail', post_id=post_id)
         # Используем шаблон create.html в режиме удаления
         form = PostForm(instance=post)
         return render(
@@ -269,9 +387,17 @@ def delete_post(request, post_id):
                 'post': post  # Передаем пост для шаблона
             }
         )
-    
-    # Удаление поста (POST запрос)
-    post.delete()
+
+    # Удаление поста (POST запрос): queryset-ом, без выборки строки
+    deleted, _ = Post.objects.filter(
+        pk=post_id,
+        author=request.user
+    ).delete()
+    if not deleted:
+        # Чужой пост по-прежнему отправляет к себе, несуществующий — 404
+        if Post.objects.filter(pk=post_id).exists():
+            return redirect('blog:post_detail', post_id=post_id)
+        raise Http404('Пост не найден')
     return redirect('blog:profile', username=request.user.username)
 
 
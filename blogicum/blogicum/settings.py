@@ -127,3 +127,8 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'blog:profile_redirect'
+
+# Keyset-пагинация списков постов вместо Paginator (COUNT + OFFSET).
+# Шаблоны с номерами страниц рассчитаны на Paginator, поэтому по
+# умолчанию выключена.
+BLOG_KEYSET_PAGINATION = False
@@ -1,22 +1,50 @@
-from django.shortcuts import render
-from django.views.generic import TemplateView
-
-
-def csrf_failure(request, reason=''):
-    return render(request, 'pages/403csrf.html', status=403)
-
-
-def page_not_found(request, exception):
-    return render(request, 'pages/404.html', status=404)
-
-
-def server_error(request):
-    return render(request, 'pages/500.html', status=500)
-
-
-class AboutView(TemplateView):
-    template_name = 'pages/about.html'
-
-
-class RulesView(TemplateView):
-    template_name = 'pages/rules.html'
+from django.conf import settings
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.views.generic import TemplateView
+
+_STATIC_ERROR_PAGES = {}
+
+
+def _static_error_page(template_name):
+    """HTML страницы ошибки, отрендеренный один раз на процесс.
+
+    Страницы ошибок отдаются и сканерам, и при всплесках ошибок —
+    повторный рендеринг шаблона на каждый ответ лишний. При DEBUG
+    рендерим каждый раз, чтобы правки шаблонов были видны сразу.
+    """
+    if settings.DEBUG:
+        return render_to_string(template_name)
+    if template_name not in _STATIC_ERROR_PAGES:
+        _STATIC_ERROR_PAGES[template_name] = render_to_string(template_name)
+    return _STATIC_ERROR_PAGES[template_name]
+
+
+def csrf_failure(request, reason=''):
+    return HttpResponse(
+        _static_error_page('pages/403csrf.html'),
+        status=403,
+        content_type='text/html; charset=utf-8'
+    )
+
+
+def page_not_found(request, exception):
+    # Страница выводит запрошенный адрес, поэтому статикой быть не может
+    return render(request, 'pages/404.html', status=404)
+
+
+def server_error(request):
+    return HttpResponse(
+        _static_error_page('pages/500.html'),
+        status=500,
+        content_type='text/html; charset=utf-8'
+    )
+
+
+class AboutView(TemplateView):
+    template_name = 'pages/about.html'
+
+
+class RulesView(TemplateView):
+    template_name = 'pages/rules.html'